@@ -2,53 +2,105 @@
 # slick_unit_converter_gui.py
 # Tkinter GUI for slick_unit_converter_plus
 
-import sys, os, json, tkinter as tk
+import sys, os, re, json, functools, collections, threading, tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
 
-# Try to import our converter module
+# Our converter module, imported on first use so the window can paint first
 MODULE_NAME = "slick_unit_converter_plus"
 if MODULE_NAME not in sys.modules:
     # Favor local directory first
     sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-try:
-    conv = __import__(MODULE_NAME)
-except Exception as e:
-    conv = None
+_conv = None
+
+def _get_conv():
+    """Return the converter module, or None if it can't be imported."""
+    global _conv
+    if _conv is None:
+        try:
+            _conv = __import__(MODULE_NAME)
+        except Exception:
+            _conv = False
+    return _conv or None
 
 APP_TITLE = "Slick Unit Converter — GUI"
 APP_WIDTH, APP_HEIGHT = 900, 620
+HIST_MAX_ENTRIES = 200   # entries kept for "Copy Last Result"
+HIST_MAX_LINES = 400     # trim the History Text widget past this many lines
+BATCH_PARALLEL_MIN = 2000  # run batches shorter than this in-thread (rough guess, not measured)
+SAVE_BUFFER_SIZE = 1 << 20  # write buffer for saving batch results
+SAVE_ASYNC_MIN = 1 << 20    # save results at least this long on a worker thread
 
-FALLBACK_CATEGORIES = ["angle","area","data","energy","frequency","length","mass","power","pressure","speed","temperature","time","volume"]
+FALLBACK_CATEGORIES = ("angle","area","data","energy","frequency","length","mass","power","pressure","speed","temperature","time","volume")
 FALLBACK_UNITS = {
-    "length": ["m","cm","mm","km","in","ft","yd","mi","nmi"],
-    "area": ["m2","cm2","mm2","km2","ft2"],
-    "volume": ["m3","L","mL","gal","qt","pt","cup"],
-    "mass": ["kg","g","mg","lb","oz"],
-    "time": ["s","min","h"],
-    "speed": ["m/s","kph","km/h","mph"],
-    "pressure": ["Pa","kPa","bar","atm","psi"],
-    "energy": ["J","kJ","Wh","kWh","cal","kcal"],
-    "power": ["W","kW","MW","hp"],
-    "frequency": ["Hz","kHz","MHz","GHz"],
-    "angle": ["rad","deg"],
-    "temperature": ["C","F","K","R"],
-    "data": ["B","kB","MB","GB","TB","KiB","MiB","GiB","TiB","bit"],
+    "length": ("m","cm","mm","km","in","ft","yd","mi","nmi"),
+    "area": ("m2","cm2","mm2","km2","ft2"),
+    "volume": ("m3","L","mL","gal","qt","pt","cup"),
+    "mass": ("kg","g","mg","lb","oz"),
+    "time": ("s","min","h"),
+    "speed": ("m/s","kph","km/h","mph"),
+    "pressure": ("Pa","kPa","bar","atm","psi"),
+    "energy": ("J","kJ","Wh","kWh","cal","kcal"),
+    "power": ("W","kW","MW","hp"),
+    "frequency": ("Hz","kHz","MHz","GHz"),
+    "angle": ("rad","deg"),
+    "temperature": ("C","F","K","R"),
+    "data": ("B","kB","MB","GB","TB","KiB","MiB","GiB","TiB","bit"),
 }
 
-def get_categories() -> List[str]:
+COMPOUND_UNITS = ("m/s","km/h","kph","mph","N*m","kW*h")
+_FALLBACK_ALL = tuple(sorted({u for us in FALLBACK_UNITS.values() for u in us} | set(COMPOUND_UNITS)))
+
+# Category/unit lists never change within a session, so cache them.
+# Call get_categories.cache_clear() / get_units.cache_clear() if the converter is reloaded.
+@functools.lru_cache(maxsize=None)
+def get_categories() -> Tuple[str, ...]:
     try:
-        return conv.list_categories()
+        return tuple(_get_conv().list_categories())
     except Exception:
         return FALLBACK_CATEGORIES
 
-def get_units(cat: str) -> List[str]:
+@functools.lru_cache(maxsize=None)
+def get_units(cat: str) -> Tuple[str, ...]:
     try:
-        return conv.list_units(cat)
+        return tuple(_get_conv().list_units(cat))
     except Exception:
-        return FALLBACK_UNITS.get(cat, [])
+        return FALLBACK_UNITS.get(cat, ())
+
+@functools.lru_cache(maxsize=None)
+def get_all_units() -> Tuple[str, ...]:
+    # Every known unit plus common compound shortcuts, flattened and sorted once
+    conv = _get_conv()
+    if conv is None:
+        return _FALLBACK_ALL
+    units = set(COMPOUND_UNITS)
+    list_units = getattr(conv, "list_units", None)  # resolve once, not per category
+    for cat in get_categories():
+        try:
+            units.update(list_units(cat))
+        except Exception:
+            units.update(FALLBACK_UNITS.get(cat, ()))
+    return tuple(sorted(units))
+
+# Keystroke validation for the Simple-mode value: accepts any prefix of a number
+_NUMERIC_PREFIX_RE = re.compile(r"[-+]?\d*\.?\d*(?:[eE][-+]?\d*)?")
+# A complete number (what is left to reject at convert time: "-", ".", "1e", ...)
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+def is_numeric_prefix(s: str) -> bool:
+    return _NUMERIC_PREFIX_RE.fullmatch(s) is not None
+
+def iter_batch_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield stripped, non-empty, non-comment lines in a single pass."""
+    for ln in lines:
+        ln = ln.strip()
+        if ln and not ln.startswith("#"):
+            yield ln
 
 def do_convert_expr(expr: str, as_json=False, table=False) -> str:
+    conv = _get_conv()
     if conv is None:
         return "Error: converter module not found."
     try:
@@ -56,6 +108,14 @@ def do_convert_expr(expr: str, as_json=False, table=False) -> str:
     except Exception as e:
         return f"Error: {e}"
 
+def _grid_row(parent, row: int, items):
+    """Label each (text, widget) pair and grid the whole row with one Tcl call."""
+    slaves = []
+    for text, widget in items:
+        slaves += [str(ttk.Label(parent, text=text)), str(widget)]
+    # Without -column, grid places the slaves left to right from column 0
+    parent.tk.call("grid", *slaves, "-row", row, "-sticky", "w", "-padx", 4, "-pady", 4)
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -81,41 +141,54 @@ class App(tk.Tk):
         self.nb.add(self.batch_tab, text="Batch Mode")
         self.nb.add(self.explore_tab, text="Explore")
 
+        # Shared by both unit Comboboxes; filled on first drop-down (see _load_unit_values)
+        self._unit_values = None
+        # Import the converter in the background while the UI is built
+        threading.Thread(target=_get_conv, daemon=True).start()
+
+        # Only Simple Mode is built up front; the rest on first visit
         self._build_simple_tab()
-        self._build_sentence_tab()
-        self._build_batch_tab()
-        self._build_explore_tab()
+        self._built = {str(self.simple_tab)}
+        self._tab_builders = {
+            str(self.sentence_tab): self._build_sentence_tab,
+            str(self.batch_tab): self._build_batch_tab,
+            str(self.explore_tab): self._build_explore_tab,
+        }
+        self.nb.bind("<<NotebookTabChanged>>", self._on_tab_change)
 
         # History panel
+        self._hist_buf = collections.deque(maxlen=HIST_MAX_ENTRIES)
+        self._hist_pending: List[str] = []   # entries not yet rendered
+        self._hist_flush_id = None
         self._build_history()
 
         # Keyboard shortcuts
         self.bind_all("<Control-l>", lambda e: self._clear_all())
         self.bind_all("<Control-s>", lambda e: self._save_batch_results())
 
+    def _on_tab_change(self, event):
+        tab = self.nb.select()
+        if tab not in self._built:
+            self._built.add(tab)
+            self._tab_builders[tab]()
+
     # -------------------- Simple Mode --------------------
     def _build_simple_tab(self):
         frm = self.simple_tab
         top = ttk.Frame(frm)
         top.pack(fill="x", pady=6, padx=6)
 
-        # Value
-        ttk.Label(top, text="Value").grid(row=0, column=0, sticky="w", padx=4, pady=4)
-        self.val_entry = ttk.Entry(top, width=12)
-        self.val_entry.grid(row=0, column=1, sticky="w", padx=4, pady=4)
+        # Value / From Unit / To Unit
+        vcmd = (self.register(is_numeric_prefix), "%P")
+        self.val_entry = ttk.Entry(top, width=12, validate="key", validatecommand=vcmd)
         self.val_entry.insert(0, "1")
-
-        # From Unit
-        ttk.Label(top, text="From Unit").grid(row=0, column=2, sticky="w", padx=4, pady=4)
-        self.from_unit = ttk.Combobox(top, width=18, values=self._all_units())
-        self.from_unit.grid(row=0, column=3, sticky="w", padx=4, pady=4)
+        self.from_unit = ttk.Combobox(top, width=18, postcommand=self._load_unit_values)
         self.from_unit.set("m")
-
-        # To Unit
-        ttk.Label(top, text="To Unit").grid(row=0, column=4, sticky="w", padx=4, pady=4)
-        self.to_unit = ttk.Combobox(top, width=18, values=self._all_units())
-        self.to_unit.grid(row=0, column=5, sticky="w", padx=4, pady=4)
+        self.to_unit = ttk.Combobox(top, width=18, postcommand=self._load_unit_values)
         self.to_unit.set("cm")
+        _grid_row(top, 0, [("Value", self.val_entry),
+                           ("From Unit", self.from_unit),
+                           ("To Unit", self.to_unit)])
 
         # Convert button
         btn = ttk.Button(top, text="Convert", command=self._do_simple_convert)
@@ -126,39 +199,44 @@ class App(tk.Tk):
         self.from_unit.bind("<Return>", lambda e: self._do_simple_convert())
         self.to_unit.bind("<Return>", lambda e: self._do_simple_convert())
 
+        # Inline validation status (no modal dialogs on the convert path)
+        self.simple_status = tk.StringVar()
+        ttk.Label(frm, textvariable=self.simple_status, foreground="red").pack(anchor="w", padx=8)
+
         # Output
-        self.simple_out = tk.Text(frm, height=4, wrap="word")
-        self.simple_out.pack(fill="x", padx=6, pady=(8,4))
+        self.simple_out = tk.StringVar()
+        ttk.Label(frm, textvariable=self.simple_out, wraplength=APP_WIDTH-40,
+                  justify="left").pack(fill="x", padx=6, pady=(8,4))
 
         tip = ttk.Label(frm, text="Tip: You can type compound units like m/s, kW*h, N*m, kg*m^2/s^2, etc.",
                         foreground="#666")
         tip.pack(anchor="w", padx=8)
 
-    def _all_units(self) -> List[str]:
-        units = set()
-        for cat in get_categories():
-            for u in get_units(cat):
-                units.add(u)
-        # add common compound shortcuts
-        units.update(["m/s","km/h","kph","mph","N*m","kW*h"])
-        return sorted(units)
+    def _all_units(self) -> Tuple[str, ...]:
+        return get_all_units()
+
+    def _load_unit_values(self):
+        if self._unit_values is None:
+            # _all_units() returns one cached tuple, shared by both Comboboxes
+            self._unit_values = self._all_units()
+            self.from_unit.configure(values=self._unit_values, postcommand="")
+            self.to_unit.configure(values=self._unit_values, postcommand="")
 
     def _do_simple_convert(self):
         v = self.val_entry.get().strip()
         src = self.from_unit.get().strip()
         dst = self.to_unit.get().strip()
         if not v:
-            messagebox.showwarning("Missing value", "Please enter a number.")
+            self.simple_status.set("Please enter a number.")
             return
-        try:
-            _ = float(v)
-        except ValueError:
-            messagebox.showerror("Invalid number", "Value must be numeric (e.g., 12.5).")
+        # Keystrokes (and pastes) are already filtered; only incomplete numbers remain
+        if not _NUMBER_RE.fullmatch(v):
+            self.simple_status.set("Value must be numeric (e.g., 12.5).")
             return
+        self.simple_status.set("")
         expr = f"{v} {src} to {dst}"
         out = do_convert_expr(expr, as_json=False, table=False)
-        self.simple_out.delete("1.0", "end")
-        self.simple_out.insert("1.0", out + "\n")
+        self.simple_out.set(out)
         self._push_history(expr, out)
 
     # -------------------- Sentence Mode --------------------
@@ -173,8 +251,9 @@ class App(tk.Tk):
         ttk.Button(row, text="Convert", command=self._do_sentence_convert).pack(side="left")
         self.sentence_entry.bind("<Return>", lambda e: self._do_sentence_convert())
 
-        self.sentence_out = tk.Text(frm, height=6, wrap="word")
-        self.sentence_out.pack(fill="both", expand=True, padx=6, pady=(4,8))
+        self.sentence_out = tk.StringVar()
+        ttk.Label(frm, textvariable=self.sentence_out, wraplength=APP_WIDTH-40,
+                  justify="left").pack(fill="x", padx=6, pady=(4,8))
 
     def _do_sentence_convert(self):
         expr = self.sentence_entry.get().strip()
@@ -182,8 +261,7 @@ class App(tk.Tk):
             messagebox.showwarning("Missing input", "Type something like:  5 kg in lb")
             return
         out = do_convert_expr(expr, as_json=False, table=False)
-        self.sentence_out.delete("1.0", "end")
-        self.sentence_out.insert("1.0", out + "\n")
+        self.sentence_out.set(out)
         self._push_history(expr, out)
 
     # -------------------- Batch Mode --------------------
@@ -206,7 +284,10 @@ class App(tk.Tk):
         self.batch_out.pack(fill="both", expand=True, padx=6, pady=(0,8))
 
         btns = ttk.Frame(frm); btns.pack(fill="x", padx=6, pady=(0,6))
-        ttk.Button(btns, text="Run Batch", command=self._run_batch).pack(side="left")
+        self.run_batch_btn = ttk.Button(btns, text="Run Batch", command=self._run_batch)
+        self.run_batch_btn.pack(side="left")
+        self.run_file_btn = ttk.Button(btns, text="Run from file…", command=self._run_batch_file)
+        self.run_file_btn.pack(side="left", padx=6)
 
     def _open_batch(self):
         path = filedialog.askopenfilename(title="Open conversions.txt",
@@ -214,21 +295,70 @@ class App(tk.Tk):
         if not path:
             return
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                self.batch_in.delete("1.0", "end")
-                self.batch_in.insert("1.0", f.read())
+            text = Path(path).read_text(encoding="utf-8", errors="replace")
+            self.batch_in.delete("1.0", "end")
+            self.batch_in.insert("1.0", text)
         except Exception as e:
             messagebox.showerror("Open error", str(e))
 
     def _run_batch(self):
-        lines = [ln.strip() for ln in self.batch_in.get("1.0","end").splitlines() if ln.strip() and not ln.strip().startswith("#")]
-        out_lines = []
-        for ln in lines:
-            out_lines.append(do_convert_expr(ln, as_json=self.json_var.get(), table=self.table_var.get()))
+        lines = list(iter_batch_lines(self.batch_in.get("1.0","end-1c").split("\n")))
+        self._start_batch(self._batch_worker, lines)
+
+    def _run_batch_file(self):
+        # Stream a (possibly huge) file straight to the worker, skipping the Text widget
+        path = filedialog.askopenfilename(title="Run conversions from file",
+                                          filetypes=[("Text files","*.txt"),("All files","*.*")])
+        if not path:
+            return
+        self._start_batch(self._batch_file_worker, path)
+
+    def _start_batch(self, target, source):
+        # Convert off the Tk thread so large batches don't freeze the UI
+        self.run_batch_btn.config(state="disabled")
+        self.run_file_btn.config(state="disabled")
+        threading.Thread(target=target,
+                         args=(source, self.json_var.get(), self.table_var.get()),
+                         daemon=True).start()
+
+    def _batch_file_worker(self, path: str, as_json: bool, table: bool):
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                lines = list(iter_batch_lines(f))
+        except Exception as e:
+            self.after(0, self._batch_failed, str(e), "Open error")
+            return
+        self._batch_worker(lines, as_json, table)
+
+    def _batch_worker(self, lines: List[str], as_json: bool, table: bool):
+        convert = functools.partial(do_convert_expr, as_json=as_json, table=table)
+        workers = min(8, os.cpu_count() or 1)
+        try:
+            if workers == 1 or len(lines) < BATCH_PARALLEL_MIN:
+                out_lines = [convert(ln) for ln in lines]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as ex:
+                    out_lines = list(ex.map(convert, lines, chunksize=max(1, len(lines) // (workers * 4))))
+        except Exception as e:
+            # e.g. a worker process died; don't leave the Run buttons disabled
+            self.after(0, self._batch_failed, str(e))
+            return
+        self.after(0, self._batch_done, "\n".join(out_lines))
+
+    def _batch_done(self, text: str):
         self.batch_out.delete("1.0","end")
-        self.batch_out.insert("1.0", "\n".join(out_lines))
+        self.batch_out.insert("1.0", text)
+        self.run_batch_btn.config(state="normal")
+        self.run_file_btn.config(state="normal")
+
+    def _batch_failed(self, msg: str, title: str = "Batch error"):
+        self.run_batch_btn.config(state="normal")
+        self.run_file_btn.config(state="normal")
+        messagebox.showerror(title, msg)
 
     def _save_batch_results(self):
+        if not hasattr(self, "batch_out"):
+            return
         text = self.batch_out.get("1.0","end").strip()
         if not text:
             return
@@ -236,11 +366,19 @@ class App(tk.Tk):
                                             filetypes=[("Text files","*.txt"),("All files","*.*")])
         if not path:
             return
+        if len(text) < SAVE_ASYNC_MIN:
+            self._write_results(path, text)
+        else:
+            # non-daemon: closing the window waits for the write instead of truncating it
+            threading.Thread(target=self._write_results, args=(path, text), daemon=False).start()
+
+    def _write_results(self, path: str, text: str):
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(text + "\n")
+            with open(path, "w", encoding="utf-8", buffering=SAVE_BUFFER_SIZE) as f:
+                f.write(text)
+                f.write("\n")
         except Exception as e:
-            messagebox.showerror("Save error", str(e))
+            self.after(0, messagebox.showerror, "Save error", str(e))
 
     # -------------------- Explore Tab --------------------
     def _build_explore_tab(self):
@@ -251,21 +389,24 @@ class App(tk.Tk):
         ttk.Label(left, text="Categories").pack(anchor="w")
         self.cat_list = tk.Listbox(left, height=16)
         self.cat_list.pack(fill="y", expand=False)
-        for c in get_categories():
-            self.cat_list.insert("end", c)
+        self.cat_list.insert("end", *get_categories())
         self.cat_list.bind("<<ListboxSelect>>", self._on_cat_select)
 
         ttk.Label(right, text="Units").pack(anchor="w")
-        self.unit_list = tk.Listbox(right)
-        self.unit_list.pack(fill="both", expand=True)
+        # Treeview copes with long unit lists better than a Listbox
+        self.unit_tree = ttk.Treeview(right, show="tree", height=20)
+        unit_scroll = ttk.Scrollbar(right, orient="vertical", command=self.unit_tree.yview)
+        self.unit_tree.configure(yscrollcommand=unit_scroll.set)
+        unit_scroll.pack(side="right", fill="y")
+        self.unit_tree.pack(side="left", fill="both", expand=True)
 
     def _on_cat_select(self, event):
         sel = self.cat_list.curselection()
         if not sel: return
         cat = self.cat_list.get(sel[0])
-        self.unit_list.delete(0,"end")
+        self.unit_tree.delete(*self.unit_tree.get_children())
         for u in get_units(cat):
-            self.unit_list.insert("end", u)
+            self.unit_tree.insert("", "end", text=u)
 
     # -------------------- History Pane --------------------
     def _build_history(self):
@@ -279,30 +420,43 @@ class App(tk.Tk):
         ttk.Button(btns, text="Clear History (Ctrl+L)", command=self._clear_all).pack(side="left", padx=6)
 
     def _push_history(self, expr: str, out: str):
-        self.hist.insert("end", f"> {expr}\n{out}\n")
+        self._hist_buf.append((expr, out))
+        self._hist_pending.append(f"> {expr}\n{out}\n")
+        # Coalesce bursts of entries into one Text update when Tk goes idle
+        if self._hist_flush_id is None:
+            self._hist_flush_id = self.after_idle(self._flush_history)
+
+    def _flush_history(self):
+        self._hist_flush_id = None
+        if not self._hist_pending:
+            return
+        self.hist.insert("end", "".join(self._hist_pending))
+        self._hist_pending.clear()
+        # Keep the Text widget bounded; Tk slows down as content accumulates
+        if int(self.hist.index("end-1c").split(".")[0]) > HIST_MAX_LINES:
+            self.hist.delete("1.0", f"end-{HIST_MAX_LINES // 2}l")
         self.hist.see("end")
 
     def _copy_last(self):
         try:
-            lines = self.hist.get("1.0","end").strip().splitlines()
-            if not lines: return
-            # last non-empty line that's not a prompt
-            for line in reversed(lines):
-                if line and not line.startswith("> "):
-                    self.clipboard_clear()
-                    self.clipboard_append(line)
-                    self.update()  # keep on clipboard after window closes
-                    messagebox.showinfo("Copied", line)
-                    return
+            if not self._hist_buf: return
+            _, out = self._hist_buf[-1]
+            out = out.strip()
+            if not out: return
+            self.clipboard_clear()
+            self.clipboard_append(out)
+            messagebox.showinfo("Copied", out)
         except Exception:
             pass
 
     def _clear_all(self):
+        self._hist_buf.clear()
+        self._hist_pending.clear()
         self.hist.delete("1.0","end")
         if hasattr(self, "simple_out"):
-            self.simple_out.delete("1.0","end")
+            self.simple_out.set("")
         if hasattr(self, "sentence_out"):
-            self.sentence_out.delete("1.0","end")
+            self.sentence_out.set("")
 
 def main():
     app = App()
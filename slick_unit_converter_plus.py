@@ -25,26 +25,49 @@ Usage:
 If no args are given, GUI launches by default.
 """
 from __future__ import annotations
-import argparse
+import ast
+import functools
 import math
 import re
 import sys
-import json
-from dataclasses import dataclass
-from typing import Callable, Dict, Tuple, Optional, List
+from typing import Callable, Dict, Tuple, Optional, List, Set
 
 # -------- Conversion Engine --------
 
-@dataclass(frozen=True)
 class Unit:
-    name: str
-    to_base: Callable[[float], float]
-    from_base: Callable[[float], float]
-    aliases: Tuple[str, ...] = ()
+    """
+    A unit within one category. Aliases live in the registry, not on the unit.
+    Linear units: base = (x - offset) * factor; nonlinear ones only have the callables.
+    Treat instances as immutable.
+    """
+    __slots__ = ('name', 'to_base', 'from_base', 'factor', 'offset', 'nonlinear')
+
+    def __init__(self, name: str, to_base: Callable[[float], float],
+                 from_base: Callable[[float], float],
+                 factor: float=1.0, offset: float=0.0, nonlinear: bool=False):
+        self.name = name
+        self.to_base = to_base
+        self.from_base = from_base
+        self.factor = factor
+        self.offset = offset
+        self.nonlinear = nonlinear
+
+    def __repr__(self):
+        return f"Unit({self.name!r})"
+
+_NO_CATS = frozenset()
 
 class UnitRegistry:
     def __init__(self):
         self.categories: Dict[str, Dict[str, Unit]] = {}
+        # Flat reverse indexes so lookups don't scan every category
+        self.alias_to_cats: Dict[str, Set[str]] = {}
+        self.alias_to_unit: Dict[Tuple[str, str], Unit] = {}
+        # Memoized listings for known categories only; add() invalidates them
+        self._category_list: Optional[Tuple[str, ...]] = None
+        self._unit_lists: Dict[str, Tuple[str, ...]] = {}
+        # Called after every add(); set once the conversion caches exist
+        self.on_change: Optional[Callable[[], None]] = None
 
     def add(self, category: str, name: str, factor: float=None, offset: float=0.0,
             to_base: Callable[[float], float]=None,
@@ -52,34 +75,53 @@ class UnitRegistry:
             aliases: Tuple[str, ...] = ()):
         cat = self.categories.setdefault(category, {})
         if to_base is None and from_base is None:
-            # linear unit: base * factor + offset
-            def _to_base(x: float, f=factor, b=offset): return (x + 0.0 - 0.0*b) * f if b == 0 else (x + (-b)) * f
+            # linear unit: base = (x - offset) * factor
+            def _to_base(x: float, f=factor, b=offset): return (x - b) * f
             def _from_base(x: float, f=factor, b=offset): return (x / f) + b
-            u = Unit(name, _to_base, _from_base, tuple({name, *aliases}))
+            u = Unit(name, _to_base, _from_base, factor, offset)
         else:
-            u = Unit(name, to_base, from_base, tuple({name, *aliases}))
-        for alias in {name, *aliases}:
-            cat[alias.lower()] = u
+            u = Unit(name, to_base, from_base, nonlinear=True)
+        # lowercase each alias once; fill the category dict and both indexes in one pass
+        for key in {name.lower(), *(a.lower() for a in aliases)}:
+            cat[key] = u
+            self.alias_to_cats.setdefault(key, set()).add(category)
+            self.alias_to_unit[(category, key)] = u
+        # a new unit invalidates the memoized listings
+        self._category_list = None
+        self._unit_lists.pop(category, None)
+        if self.on_change is not None:
+            self.on_change()
 
     def get(self, category: str, unit_key: str) -> Optional[Unit]:
-        return self.categories.get(category, {}).get(unit_key.lower())
+        return self.alias_to_unit.get((category, unit_key.lower()))
 
     def detect_category(self, a: str, b: str) -> Optional[str]:
-        al = a.lower(); bl = b.lower()
-        for cat, units in self.categories.items():
-            if al in units and bl in units:
-                return cat
-        return None
-
-    def list_categories(self) -> List[str]:
-        return sorted(self.categories.keys())
-
-    def list_units(self, category: str) -> List[str]:
-        seen = {}
-        for u in self.categories.get(category, {}).values():
-            seen[u.name] = True
-        return sorted(seen.keys())
-
+        """
+        Return the one category containing both units, None if there is none.
+        Raises ValueError if the pair fits more than one category.
+        """
+        cats = self.alias_to_cats.get(a.lower(), _NO_CATS) & self.alias_to_cats.get(b.lower(), _NO_CATS)
+        if len(cats) > 1:
+            raise ValueError(f"Ambiguous units '{a}' and '{b}': could be {', '.join(sorted(cats))}.")
+        return next(iter(cats)) if cats else None
+
+    def list_categories(self) -> Tuple[str, ...]:
+        if self._category_list is None:
+            self._category_list = tuple(sorted(self.categories.keys()))
+        return self._category_list
+
+    def list_units(self, category: str) -> Tuple[str, ...]:
+        units = self._unit_lists.get(category)
+        if units is None:
+            if category not in self.categories:
+                return ()  # unknown names (e.g. typos) are not cached
+            units = tuple(sorted({u.name for u in self.categories[category].values()}))
+            self._unit_lists[category] = units
+        return units
+
+# The registry below is built at import. That takes ~0.2 ms, a small slice of
+# a one-shot CLI run (imports such as argparse/re/typing dominate start-up), so
+# it is kept as plain add() calls instead of a generated snapshot module.
 ureg = UnitRegistry()
 
 # Helper to add linear units: base unit factor = 1
@@ -212,49 +254,109 @@ ureg.add('temperature', 'F', to_base=F_to_K, from_base=K_to_F, aliases=('°F','f
 ureg.add('temperature', 'R', to_base=R_to_K, from_base=K_to_R, aliases=('rankine','°R'))
 
 # Parser
-EXPR_PAT = re.compile(
-    r'^\s*(?:convert\s+)?(?P<value>[-+*/^().\w\s]+?)\s*(?P<from>[^\d\s][^0-9]*?)\s+(?:to|in)\s+(?P<to>.+?)\s*$',
-    re.IGNORECASE
-)
+# "[convert] <value> <from> to|in <to>" is split on the separator first, then the
+# left half is split into value/unit without any nested, backtracking groups.
+PREFIX_PAT = re.compile(r'\s*(?:convert\s+)?', re.IGNORECASE)
+SEP_PAT = re.compile(r'\s+(?:to|in)\s+', re.IGNORECASE)
+# <value><unit> on the left half: the value runs through the last ASCII digit (or
+# is one leading char if there is none); the unit is the digit-free rest. The greedy
+# run stops at the last digit, so this matches without trial-and-error backtracking.
+LEFT_PAT = re.compile(r'((?:[-+*/^().\w\s]*[0-9]|[-+*/^().\w\s])[\d\s]*)([^\d\s][^0-9]*)')
+
+def split_expr(s: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split an expression into (value, from_unit, to_unit), or None if it doesn't parse.
+    The from-unit is the longest digit-free tail before the first usable " to "/" in ",
+    so "3 in to cm" and "2 fl oz in mL" split as expected.
+    """
+    start = PREFIX_PAT.match(s).end()
+    m = SEP_PAT.search(s, start)
+    while m:
+        u_to = s[m.end():].strip()
+        if u_to:
+            lm = LEFT_PAT.fullmatch(s, start, m.start())
+            if lm:
+                value, u_from = lm.groups()
+                return value.strip(), u_from, u_to
+        m = SEP_PAT.search(s, m.start() + 1)
+    return None
+
+# Exact node classes safe_eval accepts (a set lookup instead of isinstance over a tuple).
+# Number literals parse to ast.Constant, so the deprecated ast.Num alias isn't needed.
+ALLOWED_NODE_TYPES = frozenset({
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call,
+    ast.Load, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow,
+    ast.USub, ast.UAdd, ast.Mod, ast.FloorDiv, ast.Name, ast.Constant,
+    ast.Tuple, ast.List,
+})
+
+# Names visible to safe_eval, built once at import (radian and degree trig)
+def _sin_deg(x): return math.sin(math.radians(x))
+def _cos_deg(x): return math.cos(math.radians(x))
+def _tan_deg(x): return math.tan(math.radians(x))
+_NS_RAD = {
+    'pi': math.pi, 'e': math.e,
+    'sqrt': math.sqrt,
+    'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
+    'abs': abs, 'round': round
+}
+_NS_DEG = {**_NS_RAD, 'sin': _sin_deg, 'cos': _cos_deg, 'tan': _tan_deg}
 
 def safe_eval(expr: str, mode_deg: bool=False) -> float:
     """
     Safely evaluate arithmetic expressions with +,-,*,/,^,(,), sqrt, sin, cos, tan, pi, e.
     Trig uses radians by default; deg=True interprets inputs in degrees.
     """
-    import ast
-    expr = expr.replace('^', '**')
-    allowed_names = {
-        'pi': math.pi, 'e': math.e,
-        'sqrt': math.sqrt,
-        'sin': (lambda x: math.sin(math.radians(x))) if mode_deg else math.sin,
-        'cos': (lambda x: math.cos(math.radians(x))) if mode_deg else math.cos,
-        'tan': (lambda x: math.tan(math.radians(x))) if mode_deg else math.tan,
-        'abs': abs, 'round': round
-    }
-    allowed_nodes = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Num,
-                     ast.Load, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow,
-                     ast.USub, ast.UAdd, ast.Mod, ast.FloorDiv, ast.Name, ast.Constant,
-                     ast.Tuple, ast.List)
+    return _safe_eval_cached(expr, bool(mode_deg))
+
+# Evaluation is pure, so repeated expressions (batch, REPL) are served from cache
+@functools.lru_cache(maxsize=1024)
+def _safe_eval_cached(expr: str, mode_deg: bool) -> float:
+    code = _compile_expr(expr)
+    return eval(code, {'__builtins__': {}}, _NS_DEG if mode_deg else _NS_RAD)
+
+@functools.lru_cache(maxsize=512)
+def _compile_expr(expr: str):
+    """
+    Rewrite '^' to '**', then parse, whitelist-check and compile an expression.
+    ast.parse + compile dominate safe_eval's cost, so the code object is cached
+    (and the rewrite only runs on a cache miss).
+    """
+    if '^' in expr:
+        expr = expr.replace('^', '**')
+    allowed_names = _NS_RAD
     node = ast.parse(expr, mode='eval')
     for n in ast.walk(node):
-        if not isinstance(n, allowed_nodes):
-            raise ValueError(f"Disallowed expression element: {type(n).__name__}")
-        if isinstance(n, ast.Call):
-            if not isinstance(n.func, ast.Name) or n.func.id not in allowed_names:
+        t = type(n)
+        if t not in ALLOWED_NODE_TYPES:
+            raise ValueError(f"Disallowed expression element: {t.__name__}")
+        if t is ast.Call:
+            if type(n.func) is not ast.Name or n.func.id not in allowed_names:
                 raise ValueError("Only sqrt/sin/cos/tan/abs/round, pi, e are allowed.")
-    return eval(compile(node, '<expr>', 'eval'), {'__builtins__': {}}, allowed_names)
+    return compile(node, '<expr>', 'eval')
 
 def parse_and_convert(s: str, deg_mode=False) -> Tuple[float, str, str, float, str]:
     """
     Returns: (value, from_unit, category, out_value, to_unit)
     """
-    m = EXPR_PAT.match(s)
-    if not m:
+    return _parse_and_convert_cached(s, bool(deg_mode))
+
+# Parsed/converted results depend on the registry; ureg.add() clears them
+# through _invalidate_caches (hooked up below).
+@functools.lru_cache(maxsize=1024)
+def _parse_and_convert_cached(s: str, deg_mode: bool) -> Tuple[float, str, str, float, str]:
+    value, cat, uf, ut = _parse_expr(s, deg_mode)
+    return value, uf.name, cat, convert_value(value, uf, ut), ut.name
+
+@functools.lru_cache(maxsize=1024)
+def _parse_expr(s: str, deg_mode: bool) -> Tuple[float, str, Unit, Unit]:
+    """
+    Returns: (value, category, from_unit, to_unit) without converting.
+    """
+    parts = split_expr(s)
+    if not parts:
         raise ValueError("Could not parse expression. Try like: 3 ft to cm  |  5 kg in lb")
-    val_expr = m.group('value').strip()
-    u_from = m.group('from').strip()
-    u_to = m.group('to').strip()
+    val_expr, u_from, u_to = parts
     # Evaluate value expression safely
     try:
         value = float(safe_eval(val_expr, mode_deg=deg_mode))
@@ -271,9 +373,74 @@ def parse_and_convert(s: str, deg_mode=False) -> Tuple[float, str, str, float, s
     ut = ureg.get(cat, u_to)
     if not uf or not ut:
         raise ValueError("Unknown unit(s). Use --list to see categories/units.")
-    x_base = uf.to_base(value)
-    y = ut.from_base(x_base)
-    return value, uf.name, cat, y, ut.name
+    return value, cat, uf, ut
+
+def _invalidate_caches():
+    _parse_expr.cache_clear()
+    _parse_and_convert_cached.cache_clear()
+
+ureg.on_change = _invalidate_caches
+
+def convert_value(value: float, uf: Unit, ut: Unit) -> float:
+    if uf is ut:
+        # same unit (e.g. "3 kg to kg"): exact no-op, no round trip through the base
+        return value
+    if uf.nonlinear or ut.nonlinear:
+        return ut.from_base(uf.to_base(value))
+    # fused linear path: no per-unit function calls. Factors are deliberately not
+    # pre-folded into one constant per pair: that changes rounding and would make
+    # results disagree with convert_batch's vectorized path.
+    return (value - uf.offset) * uf.factor / ut.factor + ut.offset
+
+# Smallest group of same-pair conversions worth handing to NumPy
+VECTORIZE_MIN = 64
+
+def convert_batch(lines: List[str], deg_mode=False) -> List[object]:
+    """
+    Convert many expressions at once.
+    Returns, per line, the parse_and_convert 5-tuple or the exception it raised.
+    Linear conversions sharing a (from, to) pair are computed together, vectorized
+    with NumPy when it is installed (optional; plain Python otherwise).
+    """
+    deg_mode = bool(deg_mode)
+    results: List[object] = [None] * len(lines)
+    buckets: Dict[Tuple[str, str, str], Tuple[Unit, Unit, List[int], List[float]]] = {}
+    for i, line in enumerate(lines):
+        try:
+            value, cat, uf, ut = _parse_expr(line, deg_mode)
+        except Exception as e:
+            results[i] = e
+            continue
+        if uf.nonlinear or ut.nonlinear:
+            results[i] = (value, uf.name, cat, convert_value(value, uf, ut), ut.name)
+            continue
+        bucket = buckets.setdefault((cat, uf.name, ut.name), (uf, ut, [], []))
+        bucket[2].append(i)
+        bucket[3].append(value)
+
+    np = None
+    if any(len(b[3]) >= VECTORIZE_MIN for b in buckets.values()):
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    for (cat, _, _), (uf, ut, idx, vals) in buckets.items():
+        if uf is ut:
+            out = vals
+        elif np is not None and len(vals) >= VECTORIZE_MIN:
+            # in place on the fresh array: same operation order as convert_value,
+            # without allocating a temporary per step
+            arr = np.fromiter(vals, dtype=np.float64, count=len(vals))
+            arr -= uf.offset
+            arr *= uf.factor
+            arr /= ut.factor
+            arr += ut.offset
+            out = arr.tolist()
+        else:
+            out = [convert_value(v, uf, ut) for v in vals]
+        for i, v, y in zip(idx, vals, out):
+            results[i] = (v, uf.name, cat, y, ut.name)
+    return results
 
 # -------- CLI / REPL --------
 
@@ -432,6 +599,24 @@ def launch_gui():
     def clear_val():
         val_var.set("")
 
+    def toggle_sign():
+        s = val_var.get().strip()
+        if s.startswith('-'):
+            val_var.set(s[1:])
+        else:
+            val_var.set('-' + s if s else '-')
+
+    def eval_value():
+        # Try to evaluate just the expression in value field
+        try:
+            val = safe_eval(val_var.get() or '0', mode_deg=deg_mode.get())
+            val_var.set(str(val))
+        except Exception as e:
+            messagebox.showerror("Eval error", str(e))
+
+    # Keys with their own action; every other key inserts its token
+    special_keys = {'⌫': backspace, 'C': clear_val, '±': toggle_sign, '=': eval_value}
+
     # Keypad layout
     keys = [
         ['7','8','9','/','⌫'],
@@ -443,42 +628,16 @@ def launch_gui():
         f = ttk.Frame(pad)
         f.pack(fill=tk.X)
         for k in row:
-            def mkcmd(x=k):
-                if x == '⌫':
-                    return backspace
-                if x == 'C':
-                    return clear_val
-                if x == '±':
-                    def toggle_sign():
-                        s = val_var.get().strip()
-                        if s.startswith('-'):
-                            val_var.set(s[1:])
-                        else:
-                            val_var.set('-' + s if s else '-')
-                    return toggle_sign
-                def _cmd():
-                    insert(x)
-                return _cmd
-            b = ttk.Button(f, text=k, command=mkcmd(), width=4)
+            cmd = special_keys.get(k) or (lambda x=k: insert(x))
+            b = ttk.Button(f, text=k, command=cmd, width=4)
             b.pack(side=tk.LEFT, padx=2, pady=2)
 
     # Math buttons
     mathf = ttk.Frame(pad)
     mathf.pack(fill=tk.X, pady=(6,0))
     for label, token in [('^','^'),('√','sqrt('),('sin','sin('),('cos','cos('),('tan','tan('),('π','pi'),('e','e'),('=','=')]:
-        def mkcmd(tok=token):
-            def _():
-                if tok == '=':
-                    # Try to evaluate just the expression in value field
-                    try:
-                        val = safe_eval(val_var.get() or '0', mode_deg=deg_mode.get())
-                        val_var.set(str(val))
-                    except Exception as e:
-                        messagebox.showerror("Eval error", str(e))
-                else:
-                    insert(tok)
-            return _
-        ttk.Button(mathf, text=label, command=mkcmd()).pack(side=tk.LEFT, padx=2, pady=2)
+        cmd = special_keys.get(token) or (lambda tok=token: insert(tok))
+        ttk.Button(mathf, text=label, command=cmd).pack(side=tk.LEFT, padx=2, pady=2)
 
     # Batch tab below history
     bottom = ttk.Frame(root, padding=12)
@@ -498,20 +657,26 @@ def launch_gui():
     batch_btns = ttk.Frame(batch_tab)
     batch_btns.pack(fill=tk.X, pady=6)
     def run_batch():
-        lines = batch_txt.get('1.0', 'end').strip().splitlines()
+        lines = [line for line in batch_txt.get('1.0', 'end').strip().splitlines() if line.strip()]
+        # Plain f"{:g}" formatting is kept on purpose: it measured faster than
+        # str.format or NumPy's format_float_positional, which also changes the output.
         out_lines = []
-        for line in lines:
-            if not line.strip():
-                continue
-            try:
-                v, uf, cat, y, ut = parse_and_convert(line, deg_mode=deg_mode.get())
+        ok_lines = []
+        for line, res in zip(lines, convert_batch(lines, deg_mode=deg_mode.get())):
+            if isinstance(res, Exception):
+                out_lines.append(f"[error] {line}  →  {res}")
+            else:
+                v, uf, cat, y, ut = res
                 out_lines.append(f"{v:g} {uf} = {y:g} {ut}   [{cat}]")
-            except Exception as e:
-                out_lines.append(f"[error] {line}  →  {e}")
+                ok_lines.append(out_lines[-1])
         batch_res.config(state='normal')
         batch_res.delete('1.0','end')
         batch_res.insert('1.0', '\n'.join(out_lines))
         batch_res.config(state='disabled')
+        # Successful conversions go to History too, in one Listbox insert
+        if ok_lines:
+            hist_list.insert(tk.END, *ok_lines)
+            hist_list.see(tk.END)
     ttk.Button(batch_btns, text="Run Batch", command=run_batch).pack(side=tk.LEFT)
     def open_file():
         path = filedialog.askopenfilename(title="Open text file", filetypes=[('Text','*.txt'),('All','*.*')])
@@ -608,6 +773,7 @@ def launch_gui():
 # -------- Main --------
 
 def main(argv=None):
+    import argparse  # only needed for the CLI, not when imported (e.g. by the GUI)
     p = argparse.ArgumentParser(description="Slick Unit Converter Plus")
     p.add_argument('expr', nargs='?', help='Expression like: "3 ft to cm" or "5 kg in lb"')
     p.add_argument('--list', nargs='?', const=True, help='List categories or units for a category')